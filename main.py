@@ -1,105 +1,686 @@
-import sys
-from typing import List, Optional, Dict, Union, Any, cast, TypeAlias
-from youtube_transcript_api import (
-    YouTubeTranscriptApi,
-    FetchedTranscript,
-    VideoUnavailable,
-    RequestBlocked,  # Changed from TooManyRequests
-    TranscriptsDisabled,
-    NoTranscriptFound,
-)
+from __future__ import annotations
 
-# youtube_transcript_api.errors is not the correct import path for exceptions
-from requests.exceptions import RequestException, Timeout
-from requests import Session
 import argparse
+import functools
 import logging
-from rich.console import Console
-from rich.logging import RichHandler  # Added
+import operator
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    List,
+    Optional,
+    Dict,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Union,
+    Any,
+    cast,
+    TypeAlias,
+)
 
+# requests, youtube_transcript_api, diskcache, rich and asyncio are imported where
+# they are used, so `--help` and argument errors don't pay for loading them.
+if TYPE_CHECKING:
+    import asyncio
+
+    from diskcache import Cache
+    from requests import PreparedRequest, Response, Session
+    from requests.adapters import HTTPAdapter
+    from rich.console import Console
+    from youtube_transcript_api import FetchedTranscript, YouTubeTranscriptApi
 
-console = Console()
-# error_console removed as it's no longer used. Logging handles errors.
 logger = logging.getLogger("youtube_transcript_cli")
 
+# Connection-pool sizing for the shared HTTP sessions.
+_POOL_CONNECTIONS = 10
+_POOL_MAXSIZE = 20
+# Raised by the batch modes so every worker can hold a pooled connection.
+_pool_maxsize = _POOL_MAXSIZE
+_USER_AGENT = "youtube-transcript-cli/0.1.0"
+# urllib3-level retries for 502/503/504 responses.
+_HTTP_STATUS_RETRIES = 2
+
+# On-disk transcript cache, opened lazily by _get_cache().
+_CACHE_DIR = os.path.expanduser("~/.cache/yt_transcripts")
+DEFAULT_CACHE_TTL = 86400  # seconds
+_cache: Optional[Cache] = None
+_cache_lock = threading.Lock()
+
+# Retry policy for transient network failures. Errors that will not go away on
+# their own (VideoUnavailable, TranscriptsDisabled, NoTranscriptFound) fail fast.
+DEFAULT_MAX_RETRIES = 3
+
+# Rich markup used in our log messages, stripped by the plain (non-TTY) handler.
+_MARKUP_TAG = re.compile(r"\[/?(?:bold|cyan|dim|yellow)\]")
+
+# One transcript line: "[start] text", start rounded to two decimals.
+_CUE_FORMAT = "[%.2f] %s"
+_CUE_LINE_FORMAT = _CUE_FORMAT + "\n"
+
+# Buffer size used when streaming a transcript to an output file.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Default number of videos fetched in parallel in batch mode.
+DEFAULT_CONCURRENCY = 10
+
+# Values main() uses when it skips argparse for a bare `main.py VIDEO_ID`. They
+# must match the defaults declared in _build_parser().
+_DEFAULT_OPTIONS: Dict[str, Any] = {
+    "video_ids": None,
+    "video_ids_file": None,
+    "concurrency": DEFAULT_CONCURRENCY,
+    "languages": None,
+    "output": None,
+    "proxy": None,
+    "timeout": None,
+    "no_cache": False,
+    "cache_ttl": DEFAULT_CACHE_TTL,
+    "max_retries": DEFAULT_MAX_RETRIES,
+    "log_level": "WARNING",
+    "log_level_flag": None,
+    "plain": False,
+}
+
+T = TypeVar("T")
+
+TranscriptReturnType: TypeAlias = (
+    "Union[FetchedTranscript, List[Dict[str, Union[str, float]]]]"
+)
+SessionKey: TypeAlias = Tuple[Optional[str], Optional[float]]
+
+# Sessions are cached per (proxy_uri, timeout) so repeated fetches in one process
+# share keep-alive connections. The lock guards creation for threaded callers.
+_sessions: Dict[SessionKey, Session] = {}
+_sessions_lock = threading.Lock()
+
+
+@functools.cache
+def _keepalive_adapter_class() -> Callable[..., HTTPAdapter]:
+    """HTTPAdapter with keep-alive sockets and a default timeout, defined on first use."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+
+    # urllib3's defaults already disable Nagle (TCP_NODELAY); add SO_KEEPALIVE so
+    # idle pooled connections aren't silently dropped.
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+
+    class _KeepAliveAdapter(HTTPAdapter):
+        __attrs__ = HTTPAdapter.__attrs__ + ["timeout"]
+
+        def __init__(
+            self, *args: Any, timeout: Optional[float] = None, **kwargs: Any
+        ) -> None:
+            self.timeout = timeout
+            super().__init__(*args, **kwargs)
+
+        def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+            # requests.Session has no timeout of its own and passes timeout=None
+            # unless the caller gave one, so this is where --timeout applies.
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = self.timeout
+            return super().send(request, *args, **kwargs)
+
+        def init_poolmanager(self, *args: Any, **pool_kwargs: Any) -> None:
+            pool_kwargs.setdefault("socket_options", socket_options)
+            super().init_poolmanager(*args, **pool_kwargs)
+
+        def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+            # Proxied connections come from a separate ProxyManager per proxy,
+            # which init_poolmanager never configures.
+            proxy_kwargs.setdefault("socket_options", socket_options)
+            return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    return _KeepAliveAdapter
+
+
+def _build_session(proxy_uri: Optional[str], timeout: Optional[float]) -> Session:
+    from requests import Session
+    from requests.utils import default_user_agent
+    from urllib3.util import Retry, make_headers
+
+    session = Session()
+    # One pooled adapter serves both schemes so keep-alive connections to
+    # youtube.com are reused across requests instead of re-doing TCP+TLS.
+    # Connection and read errors are left to _with_retry and its backoff; urllib3
+    # only retries idempotent requests answered by a flaky gateway, which would
+    # otherwise surface as a non-retried YouTubeRequestFailed.
+    adapter = _keepalive_adapter_class()(
+        pool_connections=_POOL_CONNECTIONS,
+        pool_maxsize=_pool_maxsize,
+        timeout=timeout,
+        max_retries=Retry(
+            total=_HTTP_STATUS_RETRIES,
+            connect=0,
+            read=False,
+            # TLS and proxy failures count as "other" errors, which total alone
+            # would still retry before _with_retry retries them again.
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Transcript payloads compress well. urllib3 lists only the encodings it can
+    # decode here, so "br" is advertised only when brotli is installed.
+    session.headers.update(
+        {
+            "User-Agent": f"{_USER_AGENT} {default_user_agent()}",
+            "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+        }
+    )
+    if proxy_uri:
+        session.proxies = {"http": proxy_uri, "https": proxy_uri}
+    return session
+
+
+def _reserve_pool_capacity(connections: int) -> None:
+    """Let sessions created from now on keep at least this many connections per host."""
+    global _pool_maxsize
+    _pool_maxsize = max(_pool_maxsize, connections)
+
+
+def _get_session(
+    proxy_uri: Optional[str] = None, timeout: Optional[float] = None
+) -> Session:
+    """Return the shared Session for this proxy/timeout pair, creating it once."""
+    key: SessionKey = (proxy_uri or None, None if timeout is None else float(timeout))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            logger.debug(
+                "Creating pooled HTTP session for proxy=%s, timeout=%s", key[0], key[1]
+            )
+            session = _build_session(*key)
+            _sessions[key] = session
+    return session
+
+
+def _get_cache() -> Cache:
+    """Open the on-disk transcript cache on first use."""
+    global _cache
+    from diskcache import Cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = Cache(_CACHE_DIR)
+        return _cache
+
+
+def _cache_get(key: Tuple[Any, ...]) -> Any:
+    """Look key up in the transcript cache; an unusable cache counts as a miss."""
+    import sqlite3
+
+    try:
+        return _get_cache().get(key)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Transcript cache unavailable, fetching without it: %s", e)
+        return None
+
+
+def _cache_set(key: Tuple[Any, ...], value: Any, ttl: float) -> None:
+    """Store value in the transcript cache, logging instead of raising on failure."""
+    import sqlite3
+
+    try:
+        _get_cache().set(key, value, expire=ttl, tag="transcript")
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Could not save the transcript to the cache: %s", e)
+
+
+def _with_retry(
+    fn: Callable[[], T],
+    *,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+) -> T:
+    """
+    Call fn, retrying transient network failures with exponential backoff and jitter.
+    Unrecoverable errors (unavailable video, disabled or missing transcripts, ...)
+    are raised immediately.
+    """
+    from requests.exceptions import ConnectionError, Timeout
+    from youtube_transcript_api import RequestBlocked
+
+    retryable_errors = (Timeout, ConnectionError, RequestBlocked)
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except retryable_errors as e:
+            if attempt >= max_retries:
+                raise
+            delay = min(cap, base * 2**attempt) * (1 + random.uniform(0, jitter))
+            attempt += 1
+            logger.warning(
+                "Transient error (%s), retrying in %.1fs (attempt %d/%d)",
+                type(e).__name__,
+                delay,
+                attempt,
+                max_retries,
+            )
+            time.sleep(delay)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_api(
+    proxy_uri: Optional[str], timeout: Optional[float]
+) -> YouTubeTranscriptApi:
+    """Return a YouTubeTranscriptApi bound to the shared session for this proxy/timeout."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    return YouTubeTranscriptApi(http_client=_get_session(proxy_uri, timeout))
+
+
+def _do_fetch(
+    video_id: str, languages: Optional[Tuple[str, ...]], ytt_api: YouTubeTranscriptApi
+) -> List[Dict[str, Union[str, float]]]:
+    # Always go through the instance's fetch(): the old get_transcript() classmethod
+    # built its own client, bypassing the pooled session, and is gone in newer
+    # releases. Without languages, fetch() falls back to its English default.
+    fetched = (
+        ytt_api.fetch(video_id, languages=languages)
+        if languages
+        else ytt_api.fetch(video_id)
+    )
+    # Plain dicts are picklable, so they can go into the on-disk cache.
+    return fetched.to_raw_data()
+
 
 def fetch_transcript(
     video_id: str,
-    languages: Optional[List[str]] = None,
+    languages: Optional[Tuple[str, ...]] = None,
     proxy_uri: Optional[str] = None,
     timeout: Optional[float] = None,
-) -> Union[FetchedTranscript, List[Dict[str, Union[str, float]]]]:
+    session: Optional[Session] = None,
+    use_cache: bool = True,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> TranscriptReturnType:
     logger.debug(
-        f"Fetching transcript for video_id='{video_id}', languages={languages}, "
-        f"proxy_uri='{proxy_uri}', timeout={timeout}"
+        "Fetching transcript for video_id=%r, languages=%r, proxy_uri=%r, "
+        "timeout=%r, use_cache=%r",
+        video_id,
+        languages,
+        proxy_uri,
+        timeout,
+        use_cache,
     )
-    http_client_args: Dict[str, Any] = {}
-    session: Optional[Session] = None
-
-    if timeout is not None or proxy_uri:
-        session = Session()
-        if timeout is not None:
-            session.timeout = float(timeout)  # type: ignore[attr-defined]
-        if proxy_uri:
-            session.proxies = {"http": proxy_uri, "https": proxy_uri}
-        http_client_args["http_client"] = session
-
-    # If only proxy_uri is provided and no timeout, YouTubeTranscriptApi
-    # can handle GenericProxyConfig itself. However, to unify, if we create a session
-    # for proxy, we use it. If proxy_uri is given but timeout is not,
-    # the above logic already correctly creates a session and sets proxies.
-    # If neither timeout nor proxy_uri, http_client_args remains empty.
-
-    # The only case not explicitly covered by session is when proxy_uri is set
-    # but timeout is NOT. The original code used GenericProxyConfig for that.
-    # Let's refine: if only proxy_uri, we can let ytt_api handle it internally
-    # or use our session. For consistency and to manage session lifecycle in one place,
-    # using our session is cleaner if any session-related param (timeout, proxy) is given.
-
-    if (
-        not http_client_args and proxy_uri
-    ):  # Should not happen with current logic, but defensive
-        # This case is if we decided *not* to create a session just for proxy
-        # ytt_api = YouTubeTranscriptApi(proxy_config=GenericProxyConfig(http_url=proxy_uri))
-        # However, the unified logic above now always creates a session if proxy_uri is present.
-        pass
-
-    ytt_api = YouTubeTranscriptApi(**http_client_args)
-
-    # Deprecation note: get_transcript is deprecated, fetch is preferred.
-    # The original code used get_transcript if no languages were specified.
-    # ytt_api.fetch() can handle empty/None languages to get default.
-    if languages:
-        result: FetchedTranscript = ytt_api.fetch(video_id, languages=languages)
-        return result
-    else:
-        raw_result: List[Dict[str, Union[str, float]]] = ytt_api.get_transcript(
-            video_id
-        )
-        return raw_result
+    # The transcript does not depend on how it was fetched, so proxy and timeout
+    # are deliberately left out of the cache key.
+    cache_key = ("transcript", video_id, languages or None)
+    if use_cache:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Transcript cache hit for video_id=%r", video_id)
+            return cast(List[Dict[str, Union[str, float]]], cached)
+
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    # Reuse the API client and pooled session for this proxy/timeout unless the
+    # caller supplies its own session.
+    ytt_api: YouTubeTranscriptApi = (
+        YouTubeTranscriptApi(http_client=session)
+        if session is not None
+        else _get_api(proxy_uri or None, timeout)
+    )
+    result = _with_retry(
+        lambda: _do_fetch(video_id, languages, ytt_api), max_retries=max_retries
+    )
+    if use_cache:
+        _cache_set(cache_key, result, cache_ttl)
+    return result
+
+
+def _batch_fetcher(
+    languages: Optional[Tuple[str, ...]],
+    proxy_uri: Optional[str],
+    timeout: Optional[float],
+    concurrency: int,
+    use_cache: bool,
+    cache_ttl: float,
+    max_retries: int,
+) -> Callable[[str], TranscriptReturnType]:
+    """
+    fetch_transcript bound to the options shared by every video in a batch, with
+    the connection pool sized so each concurrent fetch can hold a connection.
+    """
+    _reserve_pool_capacity(concurrency)
+    return functools.partial(
+        fetch_transcript,
+        languages=languages,
+        proxy_uri=proxy_uri,
+        timeout=timeout,
+        use_cache=use_cache,
+        cache_ttl=cache_ttl,
+        max_retries=max_retries,
+    )
+
+
+async def _fetch_one(
+    semaphore: asyncio.Semaphore,
+    fetch: Callable[[str], TranscriptReturnType],
+    video_id: str,
+) -> TranscriptReturnType:
+    import asyncio
+
+    async with semaphore:
+        # youtube-transcript-api is blocking, so each fetch runs in a worker thread;
+        # the pooled session keeps their connections warm.
+        return await asyncio.to_thread(fetch, video_id)
+
+
+async def fetch_transcripts(
+    video_ids: List[str],
+    languages: Optional[Tuple[str, ...]] = None,
+    proxy_uri: Optional[str] = None,
+    timeout: Optional[float] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_cache: bool = True,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> List[Union[TranscriptReturnType, BaseException]]:
+    """
+    Fetch transcripts for several videos concurrently.
+    Results are returned in the order of video_ids; a failed fetch yields the
+    exception it raised instead of a transcript.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+    fetch = _batch_fetcher(
+        languages, proxy_uri, timeout, concurrency, use_cache, cache_ttl, max_retries
+    )
+    return await asyncio.gather(
+        *(_fetch_one(semaphore, fetch, video_id) for video_id in video_ids),
+        return_exceptions=True,
+    )
+
+
+def fetch_transcripts_threaded(
+    video_ids: List[str],
+    languages: Optional[Tuple[str, ...]] = None,
+    proxy_uri: Optional[str] = None,
+    timeout: Optional[float] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_cache: bool = True,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> List[Union[TranscriptReturnType, BaseException]]:
+    """
+    Thread-pool counterpart of fetch_transcripts for callers without an event loop.
+    The GIL is released during socket I/O, so the fetches overlap. Results are
+    returned in the order of video_ids, with exceptions in place of failed fetches.
+    """
+    from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+    fetch = _batch_fetcher(
+        languages, proxy_uri, timeout, concurrency, use_cache, cache_ttl, max_retries
+    )
+    results: Dict[str, Union[TranscriptReturnType, BaseException]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures: Dict[Future[TranscriptReturnType], str] = {
+            executor.submit(fetch, video_id): video_id for video_id in video_ids
+        }
+        for future in as_completed(futures):
+            video_id = futures[future]
+            error = future.exception()
+            results[video_id] = error if error is not None else future.result()
+            logger.debug("Finished fetching video_id=%r", video_id)
+    return [results[video_id] for video_id in video_ids]
+
+
+def _cue_fields(
+    transcript_items: Union[FetchedTranscript, List[Dict[str, Any]]],
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield (start, text) for each cue."""
+    # Accepts either a FetchedTranscript (iterates FetchedTranscriptSnippet objects)
+    # or the raw list of dicts with 'start' and 'text' returned by fetch_transcript.
+    # A FetchedTranscript implies youtube_transcript_api is already loaded, so look
+    # it up instead of importing it (and requests) when printing a cache hit.
+    ytt = sys.modules.get("youtube_transcript_api")
+    is_fetched = ytt is not None and isinstance(transcript_items, ytt.FetchedTranscript)
+    # The row schema is fixed, so pick the matching C-level getter once and let
+    # map() drive the per-cue loop without any Python bytecode.
+    fields: Callable[[Any], Tuple[Any, ...]] = (
+        operator.attrgetter("start", "text")
+        if is_fetched
+        else operator.itemgetter("start", "text")
+    )
+    return map(fields, transcript_items)
+
+
+def iter_format(
+    transcript_items: Union[FetchedTranscript, List[Dict[str, Any]]],
+) -> Iterator[str]:
+    """Yield one formatted "[start] text" line per cue, each ending in a newline."""
+    return map(_CUE_LINE_FORMAT.__mod__, _cue_fields(transcript_items))
 
 
 def format_transcript(
     transcript_items: Union[FetchedTranscript, List[Dict[str, Any]]],
 ) -> str:
-    # This function now expects an iterable of dictionaries that must contain 'start' and 'text'.
-    # Both FetchedTranscript items and get_transcript items will satisfy this.
-    # Note: FetchedTranscript is directly iterable.
-    return "\n".join(
-        [
-            f"[{cast(Dict[str, Any], item)['start']:.2f}] {cast(Dict[str, Any], item)['text']}"
-            for item in transcript_items
-        ]
+    # Join unterminated lines rather than slicing the last newline off, which
+    # would copy the whole formatted transcript a second time.
+    return "\n".join(map(_CUE_FORMAT.__mod__, _cue_fields(transcript_items)))
+
+
+def _write_transcript(
+    path: str, transcript_items: Union[FetchedTranscript, List[Dict[str, Any]]]
+) -> None:
+    # Stream cue by cue through a large buffer instead of building the whole
+    # formatted transcript in memory first.
+    with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(iter_format(transcript_items))
+
+
+@functools.cache
+def _console() -> Console:
+    """Rich console for printing transcripts, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _print_transcript(
+    transcript_items: Union[FetchedTranscript, List[Dict[str, Any]]], plain: bool
+) -> None:
+    """Print a transcript to stdout, bypassing Rich when plain output is wanted."""
+    if plain:
+        # Transcript text carries no markup, so skip Rich's markup parsing and
+        # wrapping and stream the cues straight to stdout.
+        sys.stdout.writelines(iter_format(transcript_items))
+        sys.stdout.flush()
+    else:
+        _console().print(format_transcript(transcript_items))
+
+
+class _PlainFormatter(logging.Formatter):
+    """Log formatter for non-terminal stderr that drops our rich markup tags."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return _MARKUP_TAG.sub("", super().format(record))
+
+
+def _build_log_handler(level: int) -> logging.Handler:
+    """
+    Use RichHandler when stderr is a terminal. Otherwise (redirected, piped, CI)
+    use a plain StreamHandler so rich is never initialized.
+    """
+    if sys.stderr.isatty():
+        from rich.console import Console
+        from rich.logging import RichHandler
+
+        return RichHandler(
+            level=level,
+            console=Console(stderr=True),  # Keep logs out of the transcript on stdout
+            rich_tracebacks=True,
+            markup=True,  # Allow rich markup in log messages
+            show_path=False,
+            log_time_format="[%X]",  # Time only HH:MM:SS
+        )
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setLevel(level)
+    handler.setFormatter(_PlainFormatter("%(levelname)s: %(message)s"))
+    return handler
+
+
+def _log_fetch_error(
+    error: BaseException, video_id: str, languages: Optional[Tuple[str, ...]]
+) -> None:
+    """Log a user-friendly message for an error raised while fetching a transcript."""
+    from requests.exceptions import RequestException, Timeout
+    from youtube_transcript_api import (
+        VideoUnavailable,
+        RequestBlocked,  # Changed from TooManyRequests
+        TranscriptsDisabled,
+        NoTranscriptFound,
     )
 
+    if isinstance(error, VideoUnavailable):
+        msg = (
+            f"Video '{video_id}' is unavailable. "
+            "This might mean it has been deleted or set to private. "
+            "Please check the video ID and its public accessibility."
+        )
+        logger.error(msg)
+    elif isinstance(error, TranscriptsDisabled):
+        msg = (
+            f"Transcripts are disabled for video '{video_id}'. "
+            "Subtitles may not be available or were disabled by the uploader."
+        )
+        logger.error(msg)
+    elif isinstance(error, NoTranscriptFound):
+        msg = (
+            f"Could not find a transcript for video '{video_id}' "
+            "in the requested language(s)."
+        )
+        details = str(error)
+        if languages:
+            logger.error(
+                "%s Tried languages: [yellow]%s[/yellow]. Details: [dim]%s[/dim]",
+                msg,
+                ", ".join(languages),
+                details,
+            )  # extra={"markup": True} is redundant
+        else:
+            logger.error(
+                "%s Details: [dim]%s[/dim]", msg, details
+            )  # extra={"markup": True} is redundant
+    elif isinstance(error, (Timeout, RequestException)):
+        msg = (
+            "A network issue occurred (e.g., timeout or connection problem). "
+            "Please check your internet connection and try again."
+        )
+        logger.error(
+            "%s Details: [dim]%s[/dim]", msg, error
+        )  # extra={"markup": True} is redundant
+    elif isinstance(error, RequestBlocked):
+        msg = (
+            "Your request was blocked by YouTube. "
+            "This may be due to too many requests or an IP block. "
+            "Please try again later or use a proxy."
+        )
+        logger.error(msg)
+    else:
+        msg = "An unexpected error occurred."
+        # exc_info=error attaches the traceback even outside an except block
+        logger.error("%s Details: %s", msg, error, exc_info=error)
 
-def main() -> None:
+
+def _split_video_ids(value: str) -> List[str]:
+    """Split a comma-separated --video-ids value, dropping empty entries."""
+    return [vid.strip() for vid in value.split(",") if vid.strip()]
+
+
+def _read_video_ids(path: str) -> List[str]:
+    """Read one video ID per line, skipping blank lines and # comments."""
+    with open(path, encoding="utf-8") as f:
+        stripped = (line.strip() for line in f)
+        return [line for line in stripped if line and not line.startswith("#")]
+
+
+def _write_batch_results(
+    video_ids: List[str],
+    results: List[Union[TranscriptReturnType, BaseException]],
+    output_dir: Optional[str],
+    languages: Optional[Tuple[str, ...]],
+    plain: bool = False,
+) -> bool:
+    """
+    Print or save each batch result, logging failures per video.
+    With an output directory (which must already exist) each transcript goes to
+    <output_dir>/<video_id>.txt.
+    Returns True if every video was fetched and written successfully.
+    """
+    all_ok = True
+    for video_id, result in zip(video_ids, results):
+        if isinstance(result, BaseException):
+            _log_fetch_error(result, video_id, languages)
+            all_ok = False
+            continue
+        if output_dir:
+            path = os.path.join(output_dir, f"{video_id}.txt")
+            try:
+                _write_transcript(path, result)
+                logger.info("Transcript successfully saved to [cyan]%s[/cyan]", path)
+            except IOError as e:
+                logger.error("Failed to write transcript to file %s: %s", path, e)
+                all_ok = False
+        else:
+            if plain:
+                sys.stdout.write(f"==> {video_id} <==\n")
+            else:
+                _console().print(f"==> {video_id} <==", markup=False, highlight=False)
+            _print_transcript(result, plain)
+    return all_ok
+
+
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
+    """The CLI parser, built on first use and reused by later main() calls."""
     parser = argparse.ArgumentParser(
         description="Fetch YouTube video transcript",
         formatter_class=argparse.RawTextHelpFormatter,  # To better format help text
     )
     parser.add_argument(
-        "video_id", type=str, help="YouTube video ID to fetch transcript for"
+        "video_id",
+        type=str,
+        nargs="?",
+        help="YouTube video ID to fetch transcript for",
+    )
+    batch_group = parser.add_mutually_exclusive_group()
+    batch_group.add_argument(
+        "--video-ids",
+        help="Comma-separated list of video IDs to fetch concurrently\n"
+        "(with -o, the output is a directory holding <video_id>.txt files)",
+        default=None,
+    )
+    batch_group.add_argument(
+        "--video-ids-file",
+        metavar="PATH",
+        help="File with one video ID per line, fetched with a thread pool\n"
+        "(blank lines and lines starting with # are ignored)",
+        default=None,
+    )
+    parser.add_argument(
+        "--concurrency",
+        help=f"Maximum number of parallel fetches in batch mode (default: {DEFAULT_CONCURRENCY})",
+        default=DEFAULT_CONCURRENCY,
+        type=int,
     )
     parser.add_argument(
         "-l",
@@ -121,6 +702,31 @@ def main() -> None:
         default=None,
         type=int,  # argparse will handle conversion to int
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch from YouTube, bypassing the on-disk transcript cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        metavar="SECONDS",
+        help=f"How long fetched transcripts stay cached (default: {DEFAULT_CACHE_TTL})",
+        default=DEFAULT_CACHE_TTL,
+        type=float,
+    )
+    parser.add_argument(
+        "--max-retries",
+        help="Retries for transient network errors, with exponential backoff "
+        f"(default: {DEFAULT_MAX_RETRIES})",
+        default=DEFAULT_MAX_RETRIES,
+        type=int,
+    )
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Write transcripts to stdout without Rich formatting\n"
+        "(always the case when stdout is not a terminal)",
+    )
 
     # Logging verbosity arguments
     parser.add_argument(
@@ -146,57 +752,140 @@ def main() -> None:
         help="Enable debug output (DEBUG level). Overrides -v and --log-level.",
     )
 
-    args: argparse.Namespace = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        # Fast path for the most common invocation, `main.py VIDEO_ID`: the parser
+        # would only fill in defaults, so skip building it.
+        args = argparse.Namespace(video_id=argv[0], **_DEFAULT_OPTIONS)
+    else:
+        parser = _build_parser()
+        args = parser.parse_args()
+        batch = args.video_ids is not None or args.video_ids_file is not None
+        if args.video_id is None and not batch:
+            parser.error("a VIDEO_ID, --video-ids or --video-ids-file is required")
+        if args.video_id is not None and batch:
+            parser.error(
+                "VIDEO_ID cannot be combined with --video-ids or --video-ids-file"
+            )
+        if args.video_ids is not None and not _split_video_ids(args.video_ids):
+            parser.error("--video-ids must list at least one video ID")
+        if args.video_ids_file == "":
+            parser.error("--video-ids-file must name a file")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        if args.max_retries < 0:
+            parser.error("--max-retries must not be negative")
 
     # Determine effective log level
     log_level_str: str = args.log_level_flag if args.log_level_flag else args.log_level
     numeric_log_level = getattr(logging, log_level_str.upper(), logging.WARNING)
 
-    # Configure the named logger with RichHandler
-    logger.setLevel(logging.DEBUG)  # Set logger to lowest level, handler filters
+    # Configure the named logger. Its level matches the handler's so disabled
+    # calls return before a LogRecord is even created.
+    logger.setLevel(numeric_log_level)
     logger.handlers.clear()  # Remove any default or basicConfig handlers
-    rich_handler = RichHandler(
-        level=numeric_log_level,
-        rich_tracebacks=True,
-        markup=True,  # Allow rich markup in log messages
-        show_path=False,
-        log_time_format="[%X]",  # Time only HH:MM:SS
-    )
-    logger.addHandler(rich_handler)
-
-    # No need to set level on logger.handlers[0] specifically if clearing and adding new one.
-    # The RichHandler's level will control what it emits.
+    logger.addHandler(_build_log_handler(numeric_log_level))
 
-    logger.debug(f"Parsed arguments: {args}")  # Will use % formatting if changed below
+    logger.debug("Parsed arguments: %s", args)
     logger.debug(
-        f"Effective log level set to: {log_level_str} ({numeric_log_level})"
-    )  # Same
+        "Effective log level set to: %s (%d)", log_level_str, numeric_log_level
+    )
 
-    video_id_arg: str = args.video_id
+    video_id_arg: Optional[str] = args.video_id
     languages_arg: Optional[str] = args.languages
     proxy_arg: Optional[str] = args.proxy
     timeout_arg: Optional[float] = args.timeout
+    plain_output: bool = args.plain or not sys.stdout.isatty()
 
-    languages_list: Optional[List[str]] = (
-        [lang.strip() for lang in languages_arg.split(",")] if languages_arg else None
+    # A tuple so it can be used directly as a cache key.
+    languages: Optional[Tuple[str, ...]] = (
+        tuple(lang.strip() for lang in languages_arg.split(","))
+        if languages_arg
+        else None
     )
 
-    TranscriptReturnType: TypeAlias = Union[
-        FetchedTranscript, List[Dict[str, Union[str, float]]]
-    ]
+    # The same None checks as the validation above, so an empty option value
+    # can never fall through to the single-video path.
+    if args.video_ids is not None or args.video_ids_file is not None:
+        if args.video_ids is not None:
+            video_ids: List[str] = _split_video_ids(args.video_ids)
+        else:
+            try:
+                video_ids = _read_video_ids(args.video_ids_file)
+            except OSError as e:
+                logger.error(
+                    "Failed to read video IDs from %s: %s", args.video_ids_file, e
+                )
+                sys.exit(1)
+            if not video_ids:
+                logger.error("No video IDs found in %s", args.video_ids_file)
+                sys.exit(1)
+        if args.output:
+            # Create the output directory up front so a bad path fails before
+            # any transcript is fetched.
+            try:
+                os.makedirs(args.output, exist_ok=True)
+            except OSError as e:
+                logger.error("Failed to create output directory %s: %s", args.output, e)
+                sys.exit(1)
+        logger.info(
+            "Fetching %d transcripts with concurrency [bold]%d[/bold]",
+            len(video_ids),
+            args.concurrency,
+        )
+        batch_options: Dict[str, Any] = {
+            "use_cache": not args.no_cache,
+            "cache_ttl": args.cache_ttl,
+            "max_retries": args.max_retries,
+        }
+        if args.video_ids is not None:
+            import asyncio
 
+            results = asyncio.run(
+                fetch_transcripts(
+                    video_ids,
+                    languages,
+                    proxy_arg,
+                    timeout_arg,
+                    args.concurrency,
+                    **batch_options,
+                )
+            )
+        else:
+            results = fetch_transcripts_threaded(
+                video_ids,
+                languages,
+                proxy_arg,
+                timeout_arg,
+                args.concurrency,
+                **batch_options,
+            )
+        if not _write_batch_results(
+            video_ids, results, args.output, languages, plain_output
+        ):
+            sys.exit(1)
+        return
+
+    assert video_id_arg is not None  # checked during argument parsing
     try:
         logger.info("Fetching transcript for video ID: [bold]%s[/bold]", video_id_arg)
         transcript_data: TranscriptReturnType = fetch_transcript(
-            video_id_arg, languages_list, proxy_arg, timeout_arg
+            video_id_arg,
+            languages,
+            proxy_arg,
+            timeout_arg,
+            use_cache=not args.no_cache,
+            cache_ttl=args.cache_ttl,
+            max_retries=args.max_retries,
         )
 
-        formatted: str = format_transcript(transcript_data)
-
         if args.output:
             try:
-                with open(args.output, "w", encoding="utf-8") as f:
-                    f.write(formatted)
+                _write_transcript(args.output, transcript_data)
                 # Use markup with logger.info (extra={"markup": True} is redundant due to handler setting)
                 logger.info(
                     "Transcript successfully saved to [cyan]%s[/cyan]", args.output
@@ -207,63 +896,10 @@ def main() -> None:
                 )
                 sys.exit(1)
         else:
-            console.print(formatted)
+            _print_transcript(transcript_data, plain_output)
 
-    except VideoUnavailable:
-        msg = (
-            f"Video '{video_id_arg}' is unavailable. "
-            "This might mean it has been deleted or set to private. "
-            "Please check the video ID and its public accessibility."
-        )
-        logger.error(msg)
-        sys.exit(1)
-    except TranscriptsDisabled:
-        msg = (
-            f"Transcripts are disabled for video '{video_id_arg}'. "
-            "Subtitles may not be available or were disabled by the uploader."
-        )
-        logger.error(msg)
-        sys.exit(1)
-    except NoTranscriptFound as e:
-        msg = (
-            f"Could not find a transcript for video '{video_id_arg}' "
-            "in the requested language(s)."
-        )
-        details = str(e)
-        if languages_list:
-            # Example of using markup in log parts if desired, though RichHandler style is often enough
-            # Break long line for flake8
-            languages_str = ", ".join(languages_list)
-            part1 = msg
-            part2 = f" Tried languages: [yellow]{languages_str}[/yellow]."
-            part3 = f" Details: [dim]{details}[/dim]"
-            full_log_msg = f"{part1}{part2}{part3}"
-            logger.error(full_log_msg)  # extra={"markup": True} is redundant
-        else:
-            logger.error(
-                "%s Details: [dim]%s[/dim]", msg, details
-            )  # extra={"markup": True} is redundant
-        sys.exit(1)
-    except (Timeout, RequestException) as e:
-        msg = (
-            "A network issue occurred (e.g., timeout or connection problem). "
-            "Please check your internet connection and try again."
-        )
-        logger.error(
-            "%s Details: [dim]%s[/dim]", msg, e
-        )  # extra={"markup": True} is redundant
-        sys.exit(1)
-    except RequestBlocked:
-        msg = (
-            "Your request was blocked by YouTube. "
-            "This may be due to too many requests or an IP block. "
-            "Please try again later or use a proxy."
-        )
-        logger.error(msg)
-        sys.exit(1)
     except Exception as e:
-        msg = "An unexpected error occurred."
-        logger.exception("%s Details: %s", msg, e)  # logger.exception handles traceback
+        _log_fetch_error(e, video_id_arg, languages)
         sys.exit(1)
 
 
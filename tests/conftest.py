@@ -0,0 +1,117 @@
+"""Shared fixtures for the CLI tests; plain helpers live in helpers.py."""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import Mock
+
+import pytest
+import youtube_transcript_api
+
+import main as cli_main
+from helpers import ApiMocks, make_args, session_mock
+
+
+@pytest.fixture(autouse=True)
+def clear_session_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Each test starts without pooled sessions or API clients from a previous test."""
+    cli_main._sessions.clear()
+    cli_main._get_api.cache_clear()
+    monkeypatch.setattr(cli_main, "_pool_maxsize", cli_main._POOL_MAXSIZE)
+    yield
+    cli_main._sessions.clear()
+    cli_main._get_api.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[None]:
+    """Point the on-disk transcript cache at a per-test temporary directory."""
+    monkeypatch.setattr(cli_main, "_CACHE_DIR", str(tmp_path / "transcript_cache"))
+    monkeypatch.setattr(cli_main, "_cache", None)
+    yield
+    if cli_main._cache is not None:
+        cli_main._cache.close()
+
+
+@pytest.fixture(autouse=True)
+def plain_argv(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    main() inspects sys.argv for its argparse-free fast path, so don't let the
+    pytest command line leak into it.
+    """
+    monkeypatch.setattr(sys, "argv", ["main.py"])
+
+
+@pytest.fixture(autouse=True)
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """Record retry backoff delays instead of actually sleeping."""
+    recorded: List[float] = []
+    monkeypatch.setattr(cli_main.time, "sleep", recorded.append)
+    return recorded
+
+
+@pytest.fixture(scope="module")
+def shared_ytt_api() -> ApiMocks:
+    """
+    One YouTubeTranscriptApi class/client mock pair per test module; mock_ytt_api
+    resets it after every test instead of building new mocks.
+    """
+    mock_api_instance = Mock(spec_set=youtube_transcript_api.YouTubeTranscriptApi)
+    return Mock(return_value=mock_api_instance), mock_api_instance
+
+
+@pytest.fixture
+def mock_ytt_api(
+    monkeypatch: pytest.MonkeyPatch, shared_ytt_api: ApiMocks
+) -> Iterator[ApiMocks]:
+    """
+    Replace YouTubeTranscriptApi with a mock class whose instances are one shared
+    mock client. main imports the class lazily, so patch it on its package.
+    """
+    mock_ytt_api_class, mock_api_instance = shared_ytt_api
+    monkeypatch.setattr(
+        youtube_transcript_api, "YouTubeTranscriptApi", mock_ytt_api_class
+    )
+    yield shared_ytt_api
+    # Drop calls and per-test configuration; the class keeps returning the client.
+    mock_ytt_api_class.reset_mock()
+    mock_api_instance.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def mock_fetch_transcript(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock = Mock()
+    monkeypatch.setattr(cli_main, "fetch_transcript", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_parse_args(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Stub out argument parsing; returns the default args unless a test overrides it."""
+    mock = Mock(return_value=make_args())
+    monkeypatch.setattr(argparse.ArgumentParser, "parse_args", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_get_session(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock = Mock(return_value=session_mock())
+    monkeypatch.setattr(cli_main, "_get_session", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_build_parser(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock = Mock()
+    monkeypatch.setattr(cli_main, "_build_parser", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_console(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    mock = Mock()
+    monkeypatch.setattr(cli_main, "_console", mock)
+    return mock
@@ -0,0 +1,78 @@
+"""Test doubles and log-capture helpers shared by the CLI tests."""
+
+import dataclasses
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import Mock
+
+import pytest
+from requests import Session
+
+import main as cli_main
+
+
+# Default args for mocking parse_args. Frozen, so one instance is safely shared by
+# every test (and xdist worker); main() only reads attributes from it.
+@dataclasses.dataclass(frozen=True, slots=True)
+class Args:
+    video_id: Optional[str] = "test_id"
+    video_ids: Optional[str] = None
+    video_ids_file: Optional[str] = None
+    concurrency: int = 10
+    no_cache: bool = False
+    cache_ttl: float = 86400
+    max_retries: int = 3
+    languages: Optional[str] = None
+    output: Optional[str] = None
+    proxy: Optional[str] = None
+    timeout: Optional[int] = None
+    log_level: str = "WARNING"
+    log_level_flag: Optional[str] = None
+    plain: bool = False
+
+
+DEF_ARGS = Args()
+
+
+# Helper to derive args, so we can easily override parts for specific tests
+def make_args(**overrides: Any) -> Args:
+    return dataclasses.replace(DEF_ARGS, **overrides) if overrides else DEF_ARGS
+
+
+ApiMocks = Tuple[Mock, Mock]
+
+# Attribute names a Session mock may expose. Speccing against this precomputed
+# list instead of the class skips re-running dir(Session) for every mock.
+SESSION_SPEC: List[str] = sorted(dir(Session))
+
+
+def session_mock() -> Mock:
+    """A fresh Mock restricted to the requests.Session interface."""
+    return Mock(spec_set=SESSION_SPEC)
+
+
+def last_error(caplog: pytest.LogCaptureFixture) -> logging.LogRecord:
+    """
+    The most recent captured record, which must be an ERROR. Use together with
+    capture_errors_only() so lower-level records are never captured.
+    """
+    record = caplog.records[-1]
+    assert record.levelno == logging.ERROR
+    return record
+
+
+CLI_LOGGER: str = cli_main.logger.name
+
+
+def cli_records(caplog: pytest.LogCaptureFixture) -> List[logging.LogRecord]:
+    """Captured records from the CLI's own logger, filtered once per test."""
+    return [r for r in caplog.records if r.name == CLI_LOGGER]
+
+
+def capture_errors_only(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.ERROR, logger=CLI_LOGGER)
+
+
+def kwargs_of(mock: Mock) -> Dict[str, Any]:
+    """Keyword arguments of the mock's last call (call_args builds a new _Call each time)."""
+    return dict(mock.call_args.kwargs)
@@ -1,433 +1,610 @@
-from typing import List, Dict, Any, Union
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple, Union
 import pytest
-from unittest.mock import patch, MagicMock
+from diskcache import Cache
+from unittest.mock import Mock
 from main import fetch_transcript
 from requests.exceptions import Timeout as RequestsTimeout
 from requests.exceptions import RequestException  # Added
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
 import main as cli_main  # Added
 import argparse  # Added
+import dataclasses
+import asyncio
+import subprocess
+import socket
+import sqlite3
+import sys
 import logging  # Added for logging level constants
 from youtube_transcript_api import (  # Corrected import path
     VideoUnavailable,
     TranscriptsDisabled,
     NoTranscriptFound,
     RequestBlocked,
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
 )
 
-# from youtube_transcript_api import FetchedTranscript # Not strictly needed for tests if using Any
-
+from helpers import (
+    ApiMocks,
+    Args,
+    capture_errors_only,
+    cli_records,
+    kwargs_of,
+    last_error,
+    make_args,
+    session_mock,
+)
 
 # Define a type for transcript items for clarity in tests
 TranscriptItem = Dict[str, Union[str, float]]
 MockTranscriptResult = List[TranscriptItem]
+FrozenTranscript = Tuple[Mapping[str, Union[str, float]], ...]
+
+
+# What fetch_transcript returns for SAMPLE_FETCHED: plain dicts, because it pickles
+# the result into the on-disk cache.
+SAMPLE: Tuple[TranscriptItem, ...] = ({"text": "hello", "start": 0.0, "duration": 1.0},)
+# Transcript returned by the mocked API client's fetch().
+SAMPLE_FETCHED = FetchedTranscript(
+    snippets=[FetchedTranscriptSnippet(text="hello", start=0.0, duration=1.0)],
+    video_id="test_video",
+    language="English",
+    language_code="en",
+    is_generated=False,
+)
 
+# What the mocked fetch_transcript hands to main(), which only iterates and indexes it.
+sample_transcript_data: FrozenTranscript = (
+    MappingProxyType({"text": "Hello world", "start": 0.0, "duration": 1.0}),
+)
+formatted_sample_transcript: str = "[0.00] Hello world"  # Added type hint
+# The same line as captured (undecoded) from stdout by capsysbinary.
+formatted_sample_bytes: bytes = b"[0.00] Hello world"
 
-# Default args for mocking parse_args
-def_args_dict = {  # Reformatted to be multi-line
-    "video_id": "test_id",
-    "languages": None,
-    "output": None,
-    "proxy": None,
-    "timeout": None,
-    "log_level": "WARNING",
-    "log_level_flag": None,
-}
-
-
-# Helper to create Namespace, so we can easily override parts for specific tests
-def create_args_namespace(**overrides: Any) -> argparse.Namespace:
-    return argparse.Namespace(**{**def_args_dict, **overrides})
+# Log messages the verbosity tests look for.
+FETCHING_INFO = "Fetching transcript for video ID:"
+FETCHING_DEBUG = "Fetching transcript for video_id="
+PARSED_ARGS_DEBUG = "Parsed arguments:"
+EFFECTIVE_LEVEL_PREFIX = "Effective log level"
+EFFECTIVE_LEVEL_DEBUG = f"{EFFECTIVE_LEVEL_PREFIX} set to: DEBUG"
 
 
-sample_transcript_data: MockTranscriptResult = [  # Added type hint
-    {"text": "Hello world", "start": 0.0, "duration": 1.0}
-]
-formatted_sample_transcript: str = "[0.00] Hello world"  # Added type hint
+# fetch_transcript calls fetch() with languages only when some were requested.
+fetch_paths = pytest.mark.parametrize(
+    "languages", [None, ("en",)], ids=["default", "languages"]
+)
 
 
 # Test for timeout occurrence
-@patch("main.YouTubeTranscriptApi")
-def test_fetch_transcript_timeout_occurs(mock_ytt_api_class: MagicMock) -> None:
+@fetch_paths
+def test_fetch_transcript_timeout_occurs(
+    mock_ytt_api: ApiMocks, languages: Optional[Tuple[str, ...]]
+) -> None:
     """
     Tests that fetch_transcript raises a Timeout exception (or a wrapped one)
-    when the YouTubeTranscriptApi().get_transcript() or .fetch() call times out.
+    when the YouTubeTranscriptApi().fetch() call times out.
     """
-    mock_api_instance: MagicMock = MagicMock()
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
     # Simulate the timeout occurring during the actual transcript fetch call
-    timeout_message: str = "Simulated transcript fetch timeout"
-    mock_api_instance.get_transcript.side_effect = RequestsTimeout(timeout_message)
-    mock_api_instance.fetch.side_effect = RequestsTimeout(timeout_message)
-    mock_ytt_api_class.return_value = mock_api_instance
-
-    video_id: str = (
-        "any_video_id"  # This ID won't be used by the mock to fetch real data
+    mock_api_instance.fetch.side_effect = RequestsTimeout(
+        "Simulated transcript fetch timeout"
     )
 
     with pytest.raises(RequestsTimeout):
-        fetch_transcript(video_id, timeout=0.1)  # Trigger code path that uses timeout
+        # This ID won't be used by the mock to fetch real data
+        fetch_transcript("any_video_id", languages=languages, timeout=0.1)
 
-    # Also test the path where languages are provided
-    with pytest.raises(RequestsTimeout):
-        fetch_transcript(video_id, languages=["en"], timeout=0.1)
 
-
-@patch("main.YouTubeTranscriptApi")
+@fetch_paths
 def test_fetch_transcript_successful_with_timeout(
-    mock_ytt_api_class: MagicMock,
+    mock_ytt_api: ApiMocks,
+    languages: Optional[Tuple[str, ...]],
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """
     Tests that fetch_transcript returns a transcript successfully when a timeout is provided
     and the operation completes within the timeout.
     """
-    mock_api_instance: MagicMock = MagicMock()
-    dummy_transcript: MockTranscriptResult = [
-        {"text": "hello", "start": 0.0, "duration": 1.0}
-    ]
-    mock_api_instance.get_transcript.return_value = dummy_transcript
-    mock_api_instance.fetch.return_value = (
-        dummy_transcript  # for when languages are specified
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+
+    transcript: Any = fetch_transcript(
+        "test_video_id_success", languages=languages, timeout=5
     )
-    mock_ytt_api_class.return_value = mock_api_instance
 
-    video_id: str = "test_video_id_success"
-    # The actual return type from main.fetch_transcript is
-    # Union[FetchedTranscript, List[Dict[str, Union[str, float]]]].
-    # For testing purposes, we often use Any if the exact structure
-    # isn't crucial for the test's assertions, or a simplified version
-    # if we're mocking the return value.
-    transcript: Any
-    transcript = fetch_transcript(video_id, timeout=5)
+    assert transcript[0]["text"] == SAMPLE[0]["text"]
+    # YouTubeTranscriptApi was initialized with our real session, and requests
+    # the library sends through it carry the timeout
+    http_client = kwargs_of(mock_ytt_api_class)["http_client"]
+    assert isinstance(http_client, Session)
+    send = Mock(return_value=Response())
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    http_client.get("https://www.youtube.com/watch?v=test_video_id_success")
+    assert kwargs_of(send)["timeout"] == 5.0
 
-    assert transcript is not None
-    # Assuming transcript is list-like and contains dicts with "text"
-    assert transcript[0]["text"] == "hello"
-    # Check if YouTubeTranscriptApi was initialized with an http_client
-    # (our session)
-    args, kwargs = mock_ytt_api_class.call_args
-    assert "http_client" in kwargs
-    assert kwargs["http_client"] is not None
-    assert hasattr(kwargs["http_client"], "timeout")
-    assert kwargs["http_client"].timeout == 5
-
-
-@patch("main.YouTubeTranscriptApi")
+
+@fetch_paths
 def test_fetch_transcript_successful_without_timeout(
-    mock_ytt_api_class: MagicMock,
+    mock_ytt_api: ApiMocks, languages: Optional[Tuple[str, ...]]
 ) -> None:
     """
     Tests that fetch_transcript returns a transcript successfully when no timeout is provided.
     """
-    mock_api_instance: MagicMock = MagicMock()
-    dummy_transcript: MockTranscriptResult = [
-        {"text": "world", "start": 0.0, "duration": 1.0}
-    ]
-    mock_api_instance.get_transcript.return_value = dummy_transcript
-    mock_api_instance.fetch.return_value = dummy_transcript
-    mock_ytt_api_class.return_value = mock_api_instance
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
 
-    video_id: str = "test_video_id_no_timeout"
-    transcript: Any = fetch_transcript(video_id)  # No timeout argument
+    transcript: Any = fetch_transcript("test_video_id_no_timeout", languages=languages)
 
-    assert transcript is not None
-    assert transcript[0]["text"] == "world"
-    # Check if YouTubeTranscriptApi was initialized *without* an http_client (no session explicitly passed)
-    # if no timeout is given, and no proxy, it should be called with no args.
-    args, kwargs = mock_ytt_api_class.call_args
-    assert "http_client" not in kwargs or kwargs["http_client"] is None
+    assert transcript == list(SAMPLE)
+    expected_kwargs = {"languages": languages} if languages else {}
+    mock_api_instance.fetch.assert_called_once_with(
+        "test_video_id_no_timeout", **expected_kwargs
+    )
+    # Without timeout or proxy the shared, pooled default session is passed in.
+    assert kwargs_of(mock_ytt_api_class) == {"http_client": cli_main._get_session()}
 
 
-@patch("main.YouTubeTranscriptApi")
-@patch("main.Session")
-def test_fetch_transcript_with_proxy_and_timeout(
-    mock_session_class: MagicMock, mock_ytt_api_class: MagicMock
+@pytest.mark.parametrize("timeout", [None, 10])
+def test_fetch_transcript_with_proxy(
+    mock_get_session: Mock, mock_ytt_api: ApiMocks, timeout: Optional[int]
 ) -> None:
     """
-    Tests that fetch_transcript configures session with proxy when both proxy
-    and timeout are given.
+    Tests that fetch_transcript asks for the session matching the proxy (and
+    timeout, if any) and hands it to YouTubeTranscriptApi as http_client
+    rather than going through GenericProxyConfig.
     """
-    mock_api_instance: MagicMock = MagicMock()
-    dummy_transcript: MockTranscriptResult = [
-        {"text": "proxy test", "start": 0.0, "duration": 1.0}
-    ]
-    mock_api_instance.get_transcript.return_value = dummy_transcript
-    mock_ytt_api_class.return_value = mock_api_instance
-
-    mock_session_instance: MagicMock = MagicMock()
-    mock_session_class.return_value = mock_session_instance
-
-    video_id: str = "test_video_proxy_timeout"
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
     proxy_uri: str = "http://localhost:8080"
-    timeout_val: int = 10
 
     transcript: Any = fetch_transcript(
-        video_id, proxy_uri=proxy_uri, timeout=timeout_val
+        "test_video_proxy", proxy_uri=proxy_uri, timeout=timeout
     )
 
     assert transcript is not None
-    mock_session_class.assert_called_once()  # Session should be created
+    mock_get_session.assert_called_once_with(proxy_uri, timeout)
     mock_ytt_api_class.assert_called_once()
+    # Only the session is passed: no proxy_config alongside it
+    assert kwargs_of(mock_ytt_api_class) == {
+        "http_client": mock_get_session.return_value
+    }
 
-    # Check that the session instance was configured with proxies
-    assert mock_session_instance.proxies == {"http": proxy_uri, "https": proxy_uri}
-    # Check that this session instance was passed to YouTubeTranscriptApi
-    http_client_arg = mock_ytt_api_class.call_args.kwargs.get(
-        "http_client"
-    )  # noqa: E501
-    assert http_client_arg == mock_session_instance
-    assert mock_ytt_api_class.call_args.kwargs.get("proxy_config") is None
 
+def test_get_session_configures_proxy() -> None:
+    proxy_uri: str = "http://localhost:8080"
+    session = cli_main._get_session(proxy_uri, 10)
 
-@patch("main.YouTubeTranscriptApi")
-@patch("main.Session")
-def test_fetch_transcript_with_proxy_only(
-    mock_session_class: MagicMock, mock_ytt_api_class: MagicMock
-) -> None:
+    assert session.proxies == {"http": proxy_uri, "https": proxy_uri}
+    assert session is cli_main._get_session(proxy_uri, 10.0)
+
+
+def test_session_applies_timeout_to_requests(monkeypatch: pytest.MonkeyPatch) -> None:
     """
-    Tests that fetch_transcript uses GenericProxyConfig when only proxy is given.
+    Tests that the session's timeout reaches every request it sends, unless the
+    caller passes its own, since requests.Session has no default timeout.
     """
-    mock_api_instance: MagicMock = MagicMock()
-    dummy_transcript: MockTranscriptResult = [
-        {"text": "proxy only", "start": 0.0, "duration": 1.0}
-    ]
-    mock_api_instance.get_transcript.return_value = dummy_transcript
-    mock_ytt_api_class.return_value = mock_api_instance
+    send = Mock(return_value=Response())
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    url = "https://www.youtube.com/watch?v=any_video_id"
+
+    cli_main._get_session(None, 5).get(url)
+    assert kwargs_of(send)["timeout"] == 5.0
+    cli_main._get_session(None, 5).get(url, timeout=1)
+    assert kwargs_of(send)["timeout"] == 1
+    cli_main._get_session().get(url)
+    assert kwargs_of(send)["timeout"] is None
 
-    video_id: str = "test_video_proxy_only"
+
+def test_fetch_transcript_reuses_session(mock_ytt_api: ApiMocks) -> None:
+    """
+    Tests that consecutive calls with the same proxy share one pooled Session
+    and API client, while a different proxy gets its own.
+    """
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
     proxy_uri: str = "http://localhost:8080"
 
-    transcript: Any = fetch_transcript(video_id, proxy_uri=proxy_uri)
+    fetch_transcript("first_video", proxy_uri=proxy_uri)
+    first_call_session: Any = kwargs_of(mock_ytt_api_class)["http_client"]
+    fetch_transcript("second_video", proxy_uri=proxy_uri)
+    # The cached API client (and with it the session) was reused
+    assert mock_ytt_api_class.call_count == 1
+    assert cli_main._get_session(proxy_uri) is first_call_session
+    fetch_transcript("third_video", proxy_uri="http://localhost:9090")
+    other_proxy_session = kwargs_of(mock_ytt_api_class)["http_client"]
+
+    assert mock_ytt_api_class.call_count == 2
+    assert other_proxy_session is not first_call_session
+    adapter = first_call_session.get_adapter("https://www.youtube.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter is first_call_session.get_adapter("http://www.youtube.com")
+    assert adapter._pool_maxsize == cli_main._POOL_MAXSIZE
+    assert first_call_session.headers["User-Agent"].startswith(cli_main._USER_AGENT)
+    assert "br" in first_call_session.headers["Accept-Encoding"].split(",")
+
+
+def test_session_has_pooled_keepalive_adapter() -> None:
+    adapter = cli_main._get_session(None, 5).get_adapter("https://www.youtube.com")
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize >= 8
+    # urllib3 only retries gateway errors; connect/read errors go to _with_retry
+    assert adapter.max_retries.total == 2
+    assert adapter.max_retries.connect == 0
+    assert adapter.max_retries.read is False
+    assert adapter.max_retries.other == 0
+    assert set(adapter.max_retries.status_forcelist) == {502, 503, 504}
+    # Direct and proxied connections both get keep-alive sockets
+    proxy_manager = adapter.proxy_manager_for("http://localhost:8080")
+    for pool_kw in (
+        adapter.poolmanager.connection_pool_kw,
+        proxy_manager.connection_pool_kw,
+    ):
+        socket_options = pool_kw["socket_options"]
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in socket_options
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
+
+
+def test_fetch_transcript_uses_given_session(mock_ytt_api: ApiMocks) -> None:
+    """
+    Tests that an explicitly passed session is used instead of the shared one.
+    """
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+    own_session = session_mock()
+
+    fetch_transcript("any_video_id", session=own_session)
 
-    assert transcript is not None
-    mock_session_class.assert_called_once()  # Session IS now created due to refactor
-    mock_ytt_api_class.assert_called_once()
+    assert kwargs_of(mock_ytt_api_class) == {"http_client": own_session}
+    assert cli_main._sessions == {}
 
-    # Check that YouTubeTranscriptApi was called with http_client (the session)
-    # and NOT with proxy_config
-    call_kwargs = mock_ytt_api_class.call_args.kwargs
-    assert call_kwargs.get("http_client") is not None  # Session should be passed
-    assert call_kwargs.get("proxy_config") is None
-    # Further check if session passed has the proxy configured (optional here, but good for completeness)
-    assert call_kwargs.get("http_client").proxies == {
-        "http": proxy_uri,
-        "https": proxy_uri,
-    }
 
+def test_fetch_transcript_uses_disk_cache(mock_ytt_api: ApiMocks) -> None:
+    """
+    Tests that a repeated fetch for the same video and languages is served from
+    the on-disk cache, and that use_cache=False always goes to the network.
+    """
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = FetchedTranscript(
+        snippets=[FetchedTranscriptSnippet(text="cached", start=1.5, duration=2.0)],
+        video_id="cached_video",
+        language="English",
+        language_code="en",
+        is_generated=False,
+    )
+    expected: MockTranscriptResult = [{"text": "cached", "start": 1.5, "duration": 2.0}]
 
-# --- Tests for main() function ---
-# Imports moved to the top
-# Old def_args removed, sample_transcript_data and formatted_sample_transcript are already defined with type hints above.
+    first: Any = fetch_transcript("cached_video", languages=("en",))
+    second: Any = fetch_transcript("cached_video", languages=("en",))
+
+    # FetchedTranscript is stored (and returned) as plain, picklable dicts
+    assert first == expected
+    assert second == expected
+    assert mock_api_instance.fetch.call_count == 1
+    assert mock_api_instance.fetch.call_args.kwargs["languages"] == ("en",)
+
+    fetch_transcript("cached_video", languages=("de",))
+    assert mock_api_instance.fetch.call_count == 2
+
+    fetch_transcript("cached_video", languages=("en",), use_cache=False)
+    assert mock_api_instance.fetch.call_count == 3
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_video_unavailable(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+def test_fetch_transcript_without_usable_cache_dir(
+    mock_ytt_api: ApiMocks,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = VideoUnavailable(def_args_dict["video_id"])
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    # Assuming DEBUG logs from main() might also be present if default test level is low enough
-    assert len(caplog.records) >= 1
-    error_record = next(
-        r for r in reversed(caplog.records) if r.levelname == "ERROR"
-    )  # Get the last ERROR
-    assert "Video 'test_id' is unavailable" in error_record.message
-    assert "Please check the video ID" in error_record.message
-
-
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_transcripts_disabled(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    caplog: pytest.LogCaptureFixture,
+    """
+    Tests that a cache directory that cannot be created only costs the cache:
+    the transcript is still fetched and returned.
+    """
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.write_text("", encoding="utf-8")
+    monkeypatch.setattr(cli_main, "_CACHE_DIR", str(not_a_dir / "cache"))
+
+    transcript: Any = fetch_transcript("uncached_video")
+
+    assert transcript == list(SAMPLE)
+    warnings = [r for r in cli_records(caplog) if r.levelno == logging.WARNING]
+    assert [r.msg for r in warnings] == [
+        "Transcript cache unavailable, fetching without it: %s",
+        "Could not save the transcript to the cache: %s",
+    ]
+
+
+def test_fetch_transcript_keeps_result_when_cache_write_fails(
+    mock_ytt_api: ApiMocks, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = TranscriptsDisabled(def_args_dict["video_id"])
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert "Transcripts are disabled for video 'test_id'" in error_record.message
-    assert "disabled by the uploader" in error_record.message
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+    cache = Mock()
+    cache.get.return_value = None
+    cache.set.side_effect = sqlite3.OperationalError("database or disk is full")
+    monkeypatch.setattr(cli_main, "_get_cache", Mock(return_value=cache))
 
+    transcript: Any = fetch_transcript("full_disk_video")
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_no_transcript_found(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    caplog: pytest.LogCaptureFixture,
+    assert transcript == list(SAMPLE)
+    cache.set.assert_called_once()
+
+
+def test_fetch_transcript_retries_transient_errors(
+    mock_ytt_api: ApiMocks,
+    sleeps: List[float],
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = NoTranscriptFound(
-        def_args_dict["video_id"], ["en"], {}
-    )
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert "Could not find a transcript for video 'test_id'" in error_record.message
+    """
+    Tests that transient network errors are retried with exponential backoff
+    before the transcript is returned.
+    """
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    monkeypatch.setattr(cli_main.random, "uniform", lambda a, b: 0.0)
+    mock_api_instance.fetch.side_effect = [
+        RequestsTimeout("slow"),
+        RequestsConnectionError("reset"),
+        RequestBlocked("retry_video"),
+        SAMPLE_FETCHED,
+    ]
 
+    transcript: Any = fetch_transcript("retry_video", use_cache=False)
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_no_transcript_found_with_langs(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    caplog: pytest.LogCaptureFixture,
+    assert transcript == list(SAMPLE)
+    assert mock_api_instance.fetch.call_count == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_fetch_transcript_gives_up_after_max_retries(
+    mock_ytt_api: ApiMocks, sleeps: List[float]
 ) -> None:
-    video_id = "test_id_langs"
-    langs = ["es", "fr"]
-    mock_parse_args.return_value = create_args_namespace(
-        video_id=video_id, languages=",".join(langs)
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.side_effect = RequestsTimeout("still slow")
+
+    with pytest.raises(RequestsTimeout):
+        fetch_transcript("slow_video", use_cache=False, max_retries=2)
+
+    assert mock_api_instance.fetch.call_count == 3
+    assert len(sleeps) == 2
+    # Jitter adds at most 50% on top of the exponential base delay
+    assert 1.0 <= sleeps[0] <= 1.5
+    assert 2.0 <= sleeps[1] <= 3.0
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        VideoUnavailable("bad_video"),
+        TranscriptsDisabled("bad_video"),
+        NoTranscriptFound("bad_video", ["en"], {}),
+    ],
+)
+def test_fetch_transcript_does_not_retry_unrecoverable_errors(
+    mock_ytt_api: ApiMocks, error: Exception, sleeps: List[float]
+) -> None:
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.side_effect = error
+
+    with pytest.raises(type(error)):
+        fetch_transcript("bad_video", use_cache=False)
+
+    assert mock_api_instance.fetch.call_count == 1
+    assert sleeps == []
+
+
+def test_format_transcript_dicts_and_snippets() -> None:
+    """
+    Tests that format_transcript renders raw dict items and FetchedTranscript
+    snippets identically.
+    """
+    raw: MockTranscriptResult = [
+        {"text": "first line", "start": 0.0, "duration": 1.0},
+        {"text": "second line", "start": 3.456, "duration": 2.0},
+    ]
+    fetched = FetchedTranscript(
+        snippets=[
+            FetchedTranscriptSnippet(text="first line", start=0.0, duration=1.0),
+            FetchedTranscriptSnippet(text="second line", start=3.456, duration=2.0),
+        ],
+        video_id="format_video",
+        language="English",
+        language_code="en",
+        is_generated=False,
     )
-    mock_fetch_transcript.side_effect = NoTranscriptFound(video_id, langs, {})
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert f"Could not find a transcript for video '{video_id}'" in error_record.message
-    assert f"Tried languages: {', '.join(langs)}." in error_record.message
+    expected = "[0.00] first line\n[3.46] second line"
+
+    assert cli_main.format_transcript(raw) == expected
+    assert cli_main.format_transcript(fetched) == expected
+    assert cli_main.format_transcript([]) == ""
+    assert list(cli_main.iter_format(fetched)) == [
+        "[0.00] first line\n",
+        "[3.46] second line\n",
+    ]
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_network_timeout(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = RequestsTimeout("Connection timed out")
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert "A network issue occurred" in error_record.message
-    assert "Connection timed out" in error_record.message
+@pytest.mark.timeout(10)  # starts a fresh interpreter
+@pytest.mark.parametrize("cache_hit", [False, True], ids=["import", "cache_hit"])
+def test_import_defers_heavy_dependencies(cache_hit: bool) -> None:
+    """
+    Tests that importing main does not load the network, cache or rich libraries,
+    keeping `--help` and argument errors fast, and that printing a cached
+    transcript loads only the cache.
+    """
+    heavy = ["asyncio", "requests", "rich", "youtube_transcript_api"]
+    if cache_hit:
+        with Cache(cli_main._CACHE_DIR) as cache:
+            cache.set(("transcript", "cached_video", None), list(SAMPLE))
+        run_main = (
+            f"main._CACHE_DIR = {cli_main._CACHE_DIR!r}; "
+            "sys.argv = ['main.py', 'cached_video']; main.main(); "
+        )
+    else:
+        heavy.append("diskcache")
+        run_main = ""
+    code = (
+        f"import sys, main; {run_main}"
+        f"print([m for m in {heavy!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(cli_main.__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    *printed, loaded = result.stdout.splitlines()
+    assert loaded == "[]"
+    assert printed == (["[0.00] hello"] if cache_hit else [])
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_network_request_exception(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    caplog: pytest.LogCaptureFixture,
-) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = RequestException("Some other network problem")
-    with pytest.raises(SystemExit) as e_info:
-        cli_main.main()
-    assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert "A network issue occurred" in error_record.message
-    assert "Some other network problem" in error_record.message
+# --- Tests for main() function ---
+# Imports moved to the top
+# Old def_args removed, sample_transcript_data and formatted_sample_transcript are already defined with type hints above.
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_request_blocked(  # Renamed test
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+NETWORK_ISSUE = (
+    "A network issue occurred (e.g., timeout or connection problem). "
+    "Please check your internet connection and try again."
+)
+
+
+# Each case gives the canonical start of the logged message and whether the
+# error itself is passed along as the record's trailing "Details" argument.
+@pytest.mark.parametrize(
+    "error, prefix, logs_error",
+    [
+        (
+            VideoUnavailable("test_id"),
+            "Video 'test_id' is unavailable. "
+            "This might mean it has been deleted or set to private. "
+            "Please check the video ID and its public accessibility.",
+            False,
+        ),
+        (
+            TranscriptsDisabled("test_id"),
+            "Transcripts are disabled for video 'test_id'. "
+            "Subtitles may not be available or were disabled by the uploader.",
+            False,
+        ),
+        (
+            NoTranscriptFound("test_id", ["en"], {}),
+            "Could not find a transcript for video 'test_id' "
+            "in the requested language(s).",
+            False,
+        ),
+        (RequestsTimeout("Connection timed out"), NETWORK_ISSUE, True),
+        (RequestException("Some other network problem"), NETWORK_ISSUE, True),
+        (
+            RequestBlocked("test_id"),
+            "Your request was blocked by YouTube. ",
+            False,
+        ),
+        (Exception("A very generic error"), "An unexpected error occurred.", True),
+    ],
+    ids=[
+        "unavailable",
+        "disabled",
+        "no_transcript",
+        "timeout",
+        "request_exception",
+        "blocked",
+        "generic",
+    ],
+)
+def test_main_error_paths(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    error: Exception,
+    prefix: str,
+    logs_error: bool,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = RequestBlocked(def_args_dict["video_id"])
+    capture_errors_only(caplog)
+    mock_fetch_transcript.side_effect = error
     with pytest.raises(SystemExit) as e_info:
         cli_main.main()
     assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert "Your request was blocked by YouTube" in error_record.message
+    error_record = last_error(caplog)
+    assert error_record.message.startswith(prefix)
+    if logs_error:
+        assert isinstance(error_record.args, tuple) and error_record.args[-1] is error
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-def test_main_generic_exception(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+def test_main_no_transcript_found_with_langs(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()
-    mock_fetch_transcript.side_effect = Exception("A very generic error")
+    video_id = "test_id_langs"
+    langs = ["es", "fr"]
+    mock_parse_args.return_value = make_args(
+        video_id=video_id, languages=",".join(langs)
+    )
+    mock_fetch_transcript.side_effect = NoTranscriptFound(video_id, langs, {})
+    capture_errors_only(caplog)
     with pytest.raises(SystemExit) as e_info:
         cli_main.main()
     assert e_info.value.code == 1
-    assert len(caplog.records) >= 1
-    error_record = next(r for r in reversed(caplog.records) if r.levelname == "ERROR")
-    assert error_record.levelname == "ERROR"
-    assert "An unexpected error occurred." in error_record.message
-    assert "A very generic error" in error_record.message
+    error_record = last_error(caplog)
+    assert f"Could not find a transcript for video '{video_id}'" in error_record.message
+    # The rich markup is part of the message; only the plain handler strips it
+    assert (
+        f"Tried languages: [yellow]{', '.join(langs)}[/yellow]." in error_record.message
+    )
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
 def test_main_successful_stdout(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
-    capsys: pytest.CaptureFixture[str],
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    capsysbinary: pytest.CaptureFixture[bytes],
     caplog: pytest.LogCaptureFixture,  # Added caplog
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace()  # Use helper
+    mock_parse_args.return_value = make_args()  # Use helper
     mock_fetch_transcript.return_value = sample_transcript_data
 
     # No SystemExit is raised for success
     cli_main.main()
 
-    captured = capsys.readouterr()
-    assert captured.out.strip() == formatted_sample_transcript
+    captured = capsysbinary.readouterr()
+    assert captured.out.strip() == formatted_sample_bytes
 
     # Check logs based on default log level (WARNING)
-    cli_log_records = [r for r in caplog.records if r.name == "youtube_transcript_cli"]
+    cli_log_records = cli_records(caplog)
     assert not any(r.levelno < logging.WARNING for r in cli_log_records)
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
-@patch("builtins.open", new_callable=MagicMock)
 def test_main_successful_file_output(
-    mock_open: MagicMock,
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    tmp_path: Path,
     caplog: pytest.LogCaptureFixture,
-    capsys: pytest.CaptureFixture[str],
+    capsysbinary: pytest.CaptureFixture[bytes],
 ) -> None:
     video_id = "test_id_file"
-    output_file = "out.txt"
+    output_file = str(tmp_path / "out.txt")
     # Set log_level_flag to INFO to ensure the "saved" message is logged and captured
-    mock_parse_args.return_value = create_args_namespace(
+    mock_parse_args.return_value = make_args(
         video_id=video_id, output=output_file, log_level_flag="INFO"
     )
     mock_fetch_transcript.return_value = sample_transcript_data
 
-    # Configure mock_open explicitly for context manager behavior
-    mock_f_object = MagicMock()
-    mock_context_manager = MagicMock()
-    mock_context_manager.__enter__.return_value = mock_f_object
-    mock_open.return_value = mock_context_manager
-
     cli_main.main()
 
-    mock_open.assert_called_once_with(output_file, "w", encoding="utf-8")
-    mock_f_object.write.assert_called_once_with(formatted_sample_transcript)
+    # The transcript is written out in full and ends with a newline
+    written = (tmp_path / "out.txt").read_text(encoding="utf-8")
+    assert written == formatted_sample_transcript + "\n"
 
     # Check log for success message
-    # Expect DEBUG for args, INFO for fetching, INFO for saved (if log level is INFO)
-    assert (
-        len(caplog.records) >= 3
-    )  # DEBUG Parsed args, DEBUG Effective log level, INFO Fetching, INFO Saved
+    # At INFO the logger drops DEBUG calls, so only INFO Fetching and INFO Saved remain
+    assert not any(r.levelno < logging.INFO for r in caplog.records)
 
-    cli_log_records = [r for r in caplog.records if r.name == "youtube_transcript_cli"]
+    cli_log_records = cli_records(caplog)
     info_records = [r for r in cli_log_records if r.levelname == "INFO"]
 
     assert (
@@ -443,94 +620,437 @@ def test_main_successful_file_output(
     )
 
     # Check stdout is empty
-    captured_stdout = capsys.readouterr().out
-    assert captured_stdout == ""
+    captured_stdout = capsysbinary.readouterr().out
+    assert captured_stdout == b""
+
+
+def test_main_passes_languages_as_tuple(
+    mock_fetch_transcript: Mock, mock_parse_args: Mock
+) -> None:
+    mock_parse_args.return_value = make_args(languages="en, de")
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    assert mock_fetch_transcript.call_args.args[1] == ("en", "de")
 
 
 # Corrected and de-duplicated verbosity tests start here (lines after the removed block)
 # Tests for different verbosity levels
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
 def test_main_log_level_default_warning(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
     caplog: pytest.LogCaptureFixture,
-    capsys: pytest.CaptureFixture[str],
+    capsysbinary: pytest.CaptureFixture[bytes],
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace(
-        log_level="WARNING", log_level_flag=None
-    )
+    mock_parse_args.return_value = make_args(log_level="WARNING", log_level_flag=None)
     mock_fetch_transcript.return_value = sample_transcript_data
 
     cli_main.main()
 
-    cli_log_records = [r for r in caplog.records if r.name == "youtube_transcript_cli"]
+    cli_log_records = cli_records(caplog)
     for record in cli_log_records:
         assert record.levelno >= logging.WARNING
+    assert capsysbinary.readouterr().out.strip() == formatted_sample_bytes
+
+
+def test_main_log_level_default_warning_shows_errors(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    mock_parse_args.return_value = make_args(log_level="WARNING", log_level_flag=None)
+    mock_fetch_transcript.side_effect = VideoUnavailable("test_id")
 
-    mock_fetch_transcript.side_effect = VideoUnavailable(def_args_dict["video_id"])
     with pytest.raises(SystemExit):
-        caplog.clear()
         cli_main.main()
+
     assert any(
         r.levelname == "ERROR" and "Video 'test_id' is unavailable" in r.message
-        for r in caplog.records
-        if r.name == "youtube_transcript_cli"  # Ensure we check our logger
+        for r in cli_records(caplog)  # Ensure we check our logger
     )
 
-    captured = capsys.readouterr()  # From the first successful cli_main.main() call
-    assert captured.out.strip() == formatted_sample_transcript
-
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
 def test_main_log_level_verbose_info(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+    mock_ytt_api: ApiMocks,
+    mock_parse_args: Mock,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace(log_level_flag="INFO")
-    mock_fetch_transcript.return_value = sample_transcript_data
+    # The real fetch_transcript runs, so its own debug logging is exercised too
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+    mock_parse_args.return_value = make_args(log_level_flag="INFO")
     cli_main.main()
-    cli_logs = [r for r in caplog.records if r.name == "youtube_transcript_cli"]
-    assert any(
-        r.levelname == "INFO" and "Fetching transcript for video ID:" in r.message
-        for r in cli_logs
-    )
+    cli_logs = cli_records(caplog)
+    assert any(r.levelname == "INFO" and FETCHING_INFO in r.message for r in cli_logs)
     assert not any(
-        r.levelname == "DEBUG" and "Fetching transcript for video_id=" in r.message
-        for r in cli_logs
+        r.levelname == "DEBUG" and FETCHING_DEBUG in r.message for r in cli_logs
     )
     assert not any(
         r.levelname == "DEBUG"
-        and ("Parsed arguments:" in r.message or "Effective log level" in r.message)
+        and (PARSED_ARGS_DEBUG in r.message or EFFECTIVE_LEVEL_PREFIX in r.message)
         for r in cli_logs
     )
 
 
-@patch("argparse.ArgumentParser.parse_args")
-@patch("main.fetch_transcript")
 def test_main_log_level_debug(
-    mock_fetch_transcript: MagicMock,
-    mock_parse_args: MagicMock,
+    mock_ytt_api: ApiMocks,
+    mock_parse_args: Mock,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
-    mock_parse_args.return_value = create_args_namespace(log_level_flag="DEBUG")
-    mock_fetch_transcript.return_value = sample_transcript_data
+    # The real fetch_transcript runs, so its own debug logging is exercised too
+    mock_ytt_api_class, mock_api_instance = mock_ytt_api
+    mock_api_instance.fetch.return_value = SAMPLE_FETCHED
+    mock_parse_args.return_value = make_args(log_level_flag="DEBUG")
     cli_main.main()
-    cli_logs = [r for r in caplog.records if r.name == "youtube_transcript_cli"]
+    cli_logs = cli_records(caplog)
     assert any(
-        r.levelname == "DEBUG" and "Parsed arguments:" in r.message for r in cli_logs
+        r.levelname == "DEBUG" and PARSED_ARGS_DEBUG in r.message for r in cli_logs
     )
     assert any(
-        r.levelname == "DEBUG" and "Effective log level set to: DEBUG" in r.message
-        for r in cli_logs
+        r.levelname == "DEBUG" and EFFECTIVE_LEVEL_DEBUG in r.message for r in cli_logs
     )
-    assert any(
-        r.levelname == "DEBUG" and "Fetching transcript for video_id=" in r.message
-        for r in cli_logs
+    assert any(r.levelname == "DEBUG" and FETCHING_DEBUG in r.message for r in cli_logs)
+    assert any(r.levelname == "INFO" and FETCHING_INFO in r.message for r in cli_logs)
+
+
+# --- Tests for batch fetching ---
+
+
+def test_fetch_transcripts_keeps_order_and_errors(
+    mock_fetch_transcript: Mock,
+) -> None:
+    """
+    Tests that fetch_transcripts returns results in input order and hands back
+    the exception of a failed video instead of raising it.
+    """
+    unavailable = VideoUnavailable("bad_id")
+
+    def fake_fetch(video_id: str, **kwargs: Any) -> MockTranscriptResult:
+        if video_id == "bad_id":
+            raise unavailable
+        return [{"text": video_id, "start": 0.0, "duration": 1.0}]
+
+    mock_fetch_transcript.side_effect = fake_fetch
+
+    results = asyncio.run(
+        cli_main.fetch_transcripts(
+            ["first", "bad_id", "third"], ("en",), "http://localhost:8080", 5, 2
+        )
     )
-    assert any(
-        r.levelname == "INFO" and "Fetching transcript for video ID:" in r.message
-        for r in cli_logs
+
+    assert results[0] == [{"text": "first", "start": 0.0, "duration": 1.0}]
+    assert results[1] is unavailable
+    assert results[2] == [{"text": "third", "start": 0.0, "duration": 1.0}]
+    mock_fetch_transcript.assert_any_call(
+        "third",
+        languages=("en",),
+        proxy_uri="http://localhost:8080",
+        timeout=5,
+        use_cache=True,
+        cache_ttl=cli_main.DEFAULT_CACHE_TTL,
+        max_retries=cli_main.DEFAULT_MAX_RETRIES,
+    )
+
+
+def test_main_batch_video_ids(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    capsysbinary: pytest.CaptureFixture[bytes],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    mock_parse_args.return_value = make_args(video_id=None, video_ids="good_id, bad_id")
+
+    def fake_fetch(video_id: str, **kwargs: Any) -> FrozenTranscript:
+        if video_id == "bad_id":
+            raise TranscriptsDisabled(video_id)
+        return sample_transcript_data
+
+    mock_fetch_transcript.side_effect = fake_fetch
+    capture_errors_only(caplog)
+
+    with pytest.raises(SystemExit) as e_info:
+        cli_main.main()
+
+    assert e_info.value.code == 1
+    captured = capsysbinary.readouterr()
+    assert b"==> good_id <==\n" + formatted_sample_bytes in captured.out
+    assert b"==> bad_id <==" not in captured.out
+    error_record = last_error(caplog)
+    assert "Transcripts are disabled for video 'bad_id'" in error_record.message
+
+
+def test_main_batch_video_ids_output_dir(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    tmp_path: Any,
+) -> None:
+    mock_parse_args.return_value = make_args(
+        video_id=None, video_ids="one,two", output=str(tmp_path / "out")
+    )
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    for video_id in ("one", "two"):
+        saved = (tmp_path / "out" / f"{video_id}.txt").read_text(encoding="utf-8")
+        assert saved == formatted_sample_transcript + "\n"
+
+
+def test_main_batch_output_dir_not_creatable(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    existing_file = tmp_path / "existing_file.txt"
+    existing_file.write_text("", encoding="utf-8")
+    mock_parse_args.return_value = make_args(
+        video_id=None, video_ids="one,two", output=str(existing_file)
     )
+    capture_errors_only(caplog)
+
+    with pytest.raises(SystemExit) as e_info:
+        cli_main.main()
+
+    assert e_info.value.code == 1
+    message = last_error(caplog).message
+    assert message.startswith(f"Failed to create output directory {existing_file}")
+    # The bad path is caught before any transcript is fetched
+    mock_fetch_transcript.assert_not_called()
+
+
+def test_fetch_transcripts_threaded_keeps_order_and_errors(
+    mock_fetch_transcript: Mock,
+) -> None:
+    disabled = TranscriptsDisabled("bad_id")
+
+    def fake_fetch(video_id: str, **kwargs: Any) -> MockTranscriptResult:
+        if video_id == "bad_id":
+            raise disabled
+        return [{"text": video_id, "start": 0.0, "duration": 1.0}]
+
+    mock_fetch_transcript.side_effect = fake_fetch
+
+    results = cli_main.fetch_transcripts_threaded(
+        ["first", "bad_id", "third"], ("en",), concurrency=32, max_retries=1
+    )
+
+    assert results[0] == [{"text": "first", "start": 0.0, "duration": 1.0}]
+    assert results[1] is disabled
+    assert results[2] == [{"text": "third", "start": 0.0, "duration": 1.0}]
+    assert mock_fetch_transcript.call_args.kwargs["max_retries"] == 1
+    # The connection pool grows so every worker thread can keep a connection
+    assert cli_main._pool_maxsize == 32
+    adapter = cli_main._get_session().get_adapter("https://www.youtube.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 32
+
+
+def test_main_batch_video_ids_file(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    tmp_path: Path,
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("# playlist\none\n\n  two  \n", encoding="utf-8")
+    mock_parse_args.return_value = make_args(
+        video_id=None, video_ids_file=str(ids_file), concurrency=2
+    )
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    assert sorted(c.args[0] for c in mock_fetch_transcript.call_args_list) == [
+        "one",
+        "two",
+    ]
+    out = capsysbinary.readouterr().out
+    assert out.index(b"==> one <==") < out.index(b"==> two <==")
+
+
+def test_main_batch_video_ids_file_missing(
+    mock_parse_args: Mock, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    missing = str(tmp_path / "missing.txt")
+    mock_parse_args.return_value = make_args(video_id=None, video_ids_file=missing)
+
+    with pytest.raises(SystemExit) as e_info:
+        cli_main.main()
+
+    assert e_info.value.code == 1
+    assert f"Failed to read video IDs from {missing}" in caplog.records[-1].message
+
+
+def test_main_batch_video_ids_file_empty(
+    mock_fetch_transcript: Mock,
+    mock_parse_args: Mock,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("# nothing yet\n\n", encoding="utf-8")
+    mock_parse_args.return_value = make_args(
+        video_id=None, video_ids_file=str(ids_file)
+    )
+
+    with pytest.raises(SystemExit) as e_info:
+        cli_main.main()
+
+    assert e_info.value.code == 1
+    assert f"No video IDs found in {ids_file}" in caplog.records[-1].message
+    mock_fetch_transcript.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "argv, message",
+    [
+        (["vid", "--video-ids", "a,b"], b"VIDEO_ID cannot be combined"),
+        (["vid", "--video-ids-file", "ids.txt"], b"VIDEO_ID cannot be combined"),
+        (["--video-ids", ","], b"--video-ids must list at least one video ID"),
+        (["--video-ids", ""], b"--video-ids must list at least one video ID"),
+        (["--video-ids-file", ""], b"--video-ids-file must name a file"),
+    ],
+    ids=["video_ids", "video_ids_file", "only_commas", "empty", "empty_file_path"],
+)
+def test_main_rejects_invalid_batch_arguments(
+    mock_fetch_transcript: Mock,
+    argv: List[str],
+    message: bytes,
+    monkeypatch: pytest.MonkeyPatch,
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["main.py", *argv])
+
+    with pytest.raises(SystemExit) as e_info:
+        cli_main.main()
+
+    assert e_info.value.code == 2
+    assert message in capsysbinary.readouterr().err
+    mock_fetch_transcript.assert_not_called()
+
+
+# --- Tests for the argparse-free fast path ---
+
+
+def test_fast_path_defaults_match_parser() -> None:
+    """The fast path must produce exactly what argparse would for a bare VIDEO_ID."""
+    parsed = cli_main._build_parser().parse_args(["some_id"])
+    assert parsed == argparse.Namespace(video_id="some_id", **cli_main._DEFAULT_OPTIONS)
+
+
+def test_args_double_matches_parser() -> None:
+    """The Args test double must offer every option main() can read."""
+    parsed = cli_main._build_parser().parse_args(["some_id"])
+    assert {f.name for f in dataclasses.fields(Args)} == set(vars(parsed))
+
+
+def test_parser_built_once() -> None:
+    assert cli_main._build_parser() is cli_main._build_parser()
+
+
+def test_main_fast_path_skips_argparse(
+    mock_fetch_transcript: Mock,
+    mock_build_parser: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["main.py", "fast_id"])
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    mock_build_parser.assert_not_called()
+    assert mock_fetch_transcript.call_args.args[0] == "fast_id"
+    assert capsysbinary.readouterr().out.strip() == formatted_sample_bytes
+
+
+@pytest.mark.parametrize("argv", [["main.py", "--help"], ["main.py", "-v", "vid"]])
+def test_main_flags_use_argparse(
+    mock_fetch_transcript: Mock,
+    argv: List[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(sys, "argv", argv)
+    mock_fetch_transcript.return_value = sample_transcript_data
+    build_parser = Mock(wraps=cli_main._build_parser)
+    monkeypatch.setattr(cli_main, "_build_parser", build_parser)
+    try:
+        cli_main.main()
+    except SystemExit as e:
+        assert e.code == 0  # --help
+    build_parser.assert_called_once()
+
+
+# --- Tests for log handler selection ---
+
+
+def test_log_handler_plain_when_stderr_redirected(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: False)
+    handler = cli_main._build_log_handler(logging.INFO)
+
+    assert type(handler) is logging.StreamHandler
+    assert handler.level == logging.INFO
+    record = logging.LogRecord(
+        "youtube_transcript_cli",
+        logging.INFO,
+        __file__,
+        0,
+        "Saved to [cyan]%s[/cyan]",
+        ("out [1].txt",),
+        None,
+    )
+    assert handler.format(record) == "INFO: Saved to out [1].txt"
+
+
+def test_log_handler_rich_on_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    from rich.logging import RichHandler
+
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    handler = cli_main._build_log_handler(logging.DEBUG)
+
+    assert isinstance(handler, RichHandler)
+    assert handler.level == logging.DEBUG
+    assert handler.console.stderr
+
+
+# --- Tests for transcript output to stdout ---
+
+
+@pytest.mark.parametrize(
+    "argv, isatty",
+    [(["main.py", "vid"], False), (["main.py", "--plain", "vid"], True)],
+)
+def test_main_plain_output_bypasses_rich(
+    mock_fetch_transcript: Mock,
+    mock_console: Mock,
+    argv: List[str],
+    isatty: bool,
+    monkeypatch: pytest.MonkeyPatch,
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: isatty)
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    mock_console.assert_not_called()
+    assert capsysbinary.readouterr().out == formatted_sample_bytes + b"\n"
+
+
+def test_main_terminal_output_uses_rich(
+    mock_fetch_transcript: Mock,
+    mock_console: Mock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["main.py", "vid"])
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    mock_fetch_transcript.return_value = sample_transcript_data
+
+    cli_main.main()
+
+    mock_console.return_value.print.assert_called_once_with(formatted_sample_transcript)